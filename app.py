@@ -1,43 +1,34 @@
+import os
+import time
+
+_START_TIME = time.perf_counter()
+
 from dash import Dash, html, dcc, callback, Output, Input, State, callback_context
-import plotly.express as px
-import pandas as pd
 import numpy as np
 import dash_bootstrap_components as dbc
 import dash_leaflet as dl
 from math import sqrt
-from forecast_utils import make_arima_predictions, make_regression_predictions, make_hybrid_predictions  # Update import statement
-
-
-# โโละข้อมูลจากไฟล์ CSV
-def load_data():
-    data_paths = {
-        "jsps001_fe": "data/export-jsps001-1hfe_processed.csv",  # ข้อมูลที่มี fe
-        "jsps016_fe": "data/export-jsps016-1hfe_processed.csv",
-        "jsps018_fe": "data/export-jsps018-1hfe_processed.csv",
-        "jsps001": "data/export-jsps001-1h_processed.csv",  # ข้อมูลที่ไม่มี fe
-        "jsps016": "data/export-jsps016-1h_processed.csv",
-        "jsps018": "data/export-jsps018-1h_processed.csv",
-        "jsps001full": "data/export-jsps001-1hfull_processed.csv",  # ข้อมูลที่ไม่มี fe
-        "jsps016full": "data/export-jsps016-1hfull_processed.csv",
-        "jsps018full": "data/export-jsps018-1hfull_processed.csv",
-    }
-    data = {}
-    for loc, path in data_paths.items():
-        try:
-            df = pd.read_csv(path, parse_dates=["timestamp"])
-            if df.empty:
-                print(f"Warning: {loc} data is empty!")
-            else:
-                print(f"Loaded data for {loc}: {df.shape} rows and columns")
-            data[loc] = df
-        except Exception as e:
-            print(f"Error loading data for {loc}: {e}")
-            data[loc] = pd.DataFrame()  # สร้าง DataFrame ว่างหากโหลดข้อมูลไม่สำเร็จ
-    return data
+from stations import locations
+
+# ถ้ากำหนด PM25_BUNDLE ให้ map ข้อมูลจากไฟล์ bundle แทนการอ่าน CSV และโหลดโมเดล (ดู bundle.py)
+BUNDLE_PATH = os.environ.get("PM25_BUNDLE")
 
 
 # ข้อมูล
-historical_data = load_data()
+if BUNDLE_PATH:
+    from bundle import load_bundle
+
+    bundle = load_bundle(BUNDLE_PATH)
+    historical_data = bundle.load_data()
+    make_arima_predictions = bundle.predictor("arima")
+    make_regression_predictions = bundle.predictor("regression")
+    make_hybrid_predictions = bundle.predictor("hybrid")
+else:
+    from data_processing import load_data
+    from figures import make_history_figure, make_prediction_figure
+    from forecast_utils import make_arima_predictions, make_regression_predictions, make_hybrid_predictions
+
+    historical_data = load_data()
 
 # ตรวจสอบว่าข้อมูลถูกโหลดมาจริงหรือไม่
 if not historical_data:
@@ -58,13 +49,6 @@ else:
 # }
 
 
-# สถานที่และตำแหน่ง
-locations = {
-    "jsps001": {"name": "JSPs001", "lat": 13.7563, "lon": 100.5018},
-    "jsps016": {"name": "JSPs016", "lat": 13.7363, "lon": 100.5218},
-    "jsps018": {"name": "JSPs018", "lat": 13.7263, "lon": 100.5318},
-}
-
 # สร้าง Dash App
 app = Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
 
@@ -242,6 +226,19 @@ app.layout = html.Div(  # Use html.Div for full-screen layout
     style={"padding": "0", "height": "100vh", "overflow": "auto", "backgroundColor": "#0e0e0e"}  # Make container scrollable
 )
 
+print(f"Startup finished in {time.perf_counter() - _START_TIME:.3f}s (source: {'bundle' if BUNDLE_PATH else 'csv'})")
+_first_request_seen = False
+
+
+# รายงานเวลาตั้งแต่เริ่ม process จนถึง request แรก
+@app.server.before_request
+def report_time_to_first_request():
+    global _first_request_seen
+    if not _first_request_seen:
+        _first_request_seen = True
+        print(f"Time to first request: {time.perf_counter() - _START_TIME:.3f}s")
+
+
 # Update callback to display current data and forecast
 # Combine callbacks for dashboard update and prediction
 @app.callback(
@@ -265,69 +262,52 @@ def update_dashboard_and_prediction(selected_station, arima_clicks, regression_c
         return {}, [], "No Data", "", "", "", "", {}
 
     try:
-        # Get data for the selected station from the full file
-        full_file_key = f"{selected_station}full"
-        print(f"Attempting to load data from {full_file_key}")
-
-        # Check if the key exists in historical_data
-        if full_file_key not in historical_data:
-            print(f"Error: {full_file_key} not found in historical_data keys")
-            print(f"Available keys: {list(historical_data.keys())}")
-            return {}, [], "Data Not Found", "", "", "", "", {}
-
-        station_data_full = historical_data[full_file_key]
-
-        # Check if data is empty
-        if station_data_full is None or station_data_full.empty:
-            print(f"Error: Data for {full_file_key} is empty or None")
-            return {}, [], "No Data Available", "", "", "", "", {}
-
-        print(f"Successfully loaded data for {full_file_key}")
-        print(f"Data shape: {station_data_full.shape}")
-        print(f"Data columns: {station_data_full.columns.tolist()}")
-        print(f"First row: {station_data_full.iloc[0].to_dict()}")
-        print(f"Last row: {station_data_full.iloc[-1].to_dict()}")
-
-        # Ensure the data is sorted by timestamp
-        station_data_full = station_data_full.sort_values('timestamp')
-
-        # Create the time series plot with all numeric columns
-        last_date = station_data_full['timestamp'].max()
-        seven_days_ago = last_date - pd.Timedelta(days=7)
-        filtered_data = station_data_full[station_data_full['timestamp'] >= seven_days_ago]
-
-        print(f"Filtered data shape: {filtered_data.shape}")
-
-        # Get all numeric columns except timestamp for plotting
-        numeric_columns = filtered_data.select_dtypes(include=['number']).columns
-        print(f"Numeric columns: {numeric_columns.tolist()}")
-
-        if len(numeric_columns) == 0:
-            print("Error: No numeric columns found in data")
-            return {}, [], "No Numeric Data", "", "", "", "", {}
-
-        # Create the time series plot with all numeric columns
-        fig = px.line(
-            filtered_data,
-            x="timestamp",
-            y=numeric_columns,  # Show all numeric columns
-            title=f"All Features for {locations[selected_station]['name']} (Last 7 Days)",
-            labels={"value": "Feature Values", "timestamp": "Date"},
-            color_discrete_sequence=px.colors.qualitative.Plotly
-        )
+        if BUNDLE_PATH:
+            # ใช้กราฟและค่าล่าสุดที่สร้างไว้ตอน build bundle โดยไม่ต้องใช้ pandas หรือ plotly
+            view = bundle.station_view(selected_station)
+            if view is None:
+                print(f"Error: No data for {selected_station} in bundle")
+                return {}, [], "No Data Available", "", "", "", "", {}
+            fig = view["history"]
+            if fig is None:
+                print("Error: No numeric columns found in data")
+                return {}, [], "No Numeric Data", "", "", "", "", {}
+            latest_data = view["latest"]
+        else:
+            # Get data for the selected station from the full file
+            full_file_key = f"{selected_station}full"
+            print(f"Attempting to load data from {full_file_key}")
 
-        fig.update_layout(
-            height=300,
-            margin=dict(l=20, r=20, t=40, b=20),
-            xaxis_title="Date",
-            yaxis_title="Feature Values",
-            plot_bgcolor='rgba(0,0,0,0)',
-            paper_bgcolor='rgba(0,0,0,0)',
-            legend_title="Features"
-        )
+            # Check if the key exists in historical_data
+            if full_file_key not in historical_data:
+                print(f"Error: {full_file_key} not found in historical_data keys")
+                print(f"Available keys: {list(historical_data.keys())}")
+                return {}, [], "Data Not Found", "", "", "", "", {}
+
+            station_data_full = historical_data[full_file_key]
+
+            # Check if data is empty
+            if station_data_full is None or station_data_full.empty:
+                print(f"Error: Data for {full_file_key} is empty or None")
+                return {}, [], "No Data Available", "", "", "", "", {}
+
+            print(f"Successfully loaded data for {full_file_key}")
+            print(f"Data shape: {station_data_full.shape}")
+            print(f"Data columns: {station_data_full.columns.tolist()}")
+            print(f"First row: {station_data_full.iloc[0].to_dict()}")
+            print(f"Last row: {station_data_full.iloc[-1].to_dict()}")
+
+            # Ensure the data is sorted by timestamp
+            station_data_full = station_data_full.sort_values('timestamp')
+
+            # Create the time series plot with all numeric columns
+            fig = make_history_figure(station_data_full, locations[selected_station]['name'])
+            if fig is None:
+                print("Error: No numeric columns found in data")
+                return {}, [], "No Numeric Data", "", "", "", "", {}
 
-        # Get the latest data for station info
-        latest_data = station_data_full.iloc[-1]
+            # Get the latest data for station info
+            latest_data = station_data_full.iloc[-1]
 
         # Assign each feature to a card - round to 2 decimal places
         card_1_content = f"Temperature: {round(float(latest_data.get('temperature', 0)), 2):.2f}°C"
@@ -383,25 +363,11 @@ def update_dashboard_and_prediction(selected_station, arima_clicks, regression_c
             return fig, forecast_display, current_pm25, card_1_content, card_2_content, card_3_content, card_4_content, {}
 
         # Create the prediction plot
-        prediction_fig = px.line(
-            x=future_dates,
-            y=predicted_values,
-            title=f"{model_type.capitalize()} Prediction for {locations[selected_station]['name']} (Next 7 Days)",
-            labels={"y": "Predicted PM2.5 (μg/m³)", "x": "Date"},
-            color_discrete_sequence=['#FF5733']
-        )
-        
-        # Update layout for better visualization
-        prediction_fig.update_layout(
-            height=200,  # Reduced height to fit screen
-            margin=dict(l=20, r=20, t=40, b=20),  # Reduced margins
-            xaxis_title="",
-            yaxis_title="PM2.5",
-            showlegend=False,
-            plot_bgcolor='white',  # Set background color to white
-            paper_bgcolor='white'  # Set paper background color to white
-        )
-        
+        if BUNDLE_PATH:
+            prediction_fig = bundle.prediction_figure(model_type, selected_station)
+        else:
+            prediction_fig = make_prediction_figure(predicted_values, future_dates, model_type, locations[selected_station]['name'])
+
         # Update forecast display with prediction results
         # Create a new forecast display with a weather-app style layout
         forecast_rows = []
@@ -0,0 +1,315 @@
+import json
+import os
+import subprocess
+import sys
+import time
+from collections.abc import Mapping
+from datetime import datetime
+
+import numpy as np
+
+from stations import locations
+
+# pandas และ plotly ถูก import ภายในฟังก์ชันเท่านั้น เพื่อให้การเริ่มแอปจาก bundle ไม่ต้องเสียเวลา import
+
+
+# ไฟล์ bundle เดียวที่รวมข้อมูลสถานี, ผลพยากรณ์ และกราฟของ dashboard ที่สร้างไว้ล่วงหน้า
+BUNDLE_ENV = "PM25_BUNDLE"
+BUNDLE_MAGIC = b"PM25BNDL"
+BUNDLE_VERSION = 2
+DEFAULT_BUNDLE_PATH = "build/pm25.bundle"
+FORECAST_DAYS = 7
+ALIGNMENT = 64
+
+# Header: magic (8 bytes) + version (uint32) + index length (uint64)
+_HEADER_DTYPE = np.dtype([("magic", "S8"), ("version", "<u4"), ("index_len", "<u8")])
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+# Build the bundle from the CSV files and the pre-trained models
+def build_bundle(path=DEFAULT_BUNDLE_PATH, data=None, predictors=None):
+    import pandas as pd
+
+    from figures import make_history_figure, make_prediction_figure
+
+    if data is None:
+        from data_processing import load_data
+
+        data = load_data()
+    if predictors is None:
+        # Import here so that serving from a bundle never pulls in pycaret
+        import forecast_utils
+
+        predictors = {
+            "arima": forecast_utils.make_arima_predictions,
+            "regression": forecast_utils.make_regression_predictions,
+            "hybrid": forecast_utils.make_hybrid_predictions,
+        }
+
+    index = {
+        "version": BUNDLE_VERSION,
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "forecast_days": FORECAST_DAYS,
+        "tables": {},
+        "forecasts": {},
+        "views": {},
+    }
+    arrays = []
+
+    def add_array(values):
+        arrays.append(np.ascontiguousarray(values))
+        return len(arrays) - 1
+
+    def add_figure(fig):
+        return add_array(np.frombuffer(fig.to_json().encode("utf-8"), dtype=np.uint8))
+
+    for key, df in data.items():
+        columns = {}
+        for col in df.columns:
+            values = df[col].to_numpy()
+            if values.dtype.kind == "M":
+                values = values.astype("datetime64[ns]").view("<i8")
+                columns[col] = {"array": add_array(values), "kind": "datetime"}
+            elif values.dtype.kind in "biuf":
+                columns[col] = {"array": add_array(values), "kind": "numeric"}
+            else:
+                raise ValueError(f"Column '{col}' of {key} has unsupported dtype {values.dtype}")
+        index["tables"][key] = {"columns": list(df.columns), "data": columns}
+
+    for model_type, predict in predictors.items():
+        index["forecasts"][model_type] = {}
+        for station_key, station in locations.items():
+            predicted_values, future_dates = predict(station_key, FORECAST_DAYS)
+            predicted_values = np.asarray(predicted_values, dtype="<f8")
+            future_dates = pd.DatetimeIndex(future_dates)
+            # ค่าพยากรณ์ต้องมีจำนวนวันตรงกับที่ขอและตรงกับวันที่ ไม่เช่นนั้น bundle จะเสิร์ฟค่าที่ไม่ตรงวัน
+            if not len(predicted_values) == len(future_dates) == FORECAST_DAYS:
+                raise ValueError(
+                    f"{model_type} forecast for {station_key} has {len(predicted_values)} values and "
+                    f"{len(future_dates)} dates, expected {FORECAST_DAYS} of each"
+                )
+            prediction_fig = make_prediction_figure(predicted_values, future_dates, model_type, station["name"])
+            index["forecasts"][model_type][station_key] = {
+                "values": add_array(predicted_values),
+                "dates": add_array(future_dates.values.astype("datetime64[ns]").view("<i8")),
+                "figure": add_figure(prediction_fig),
+            }
+
+    # สิ่งที่ callback ต้องใช้ตอนเปิดหน้าแรก: กราฟย้อนหลังและค่าล่าสุดของแต่ละสถานี
+    for station_key, station in locations.items():
+        station_data_full = data.get(f"{station_key}full")
+        if station_data_full is None or station_data_full.empty:
+            continue
+        station_data_full = station_data_full.sort_values("timestamp")
+        fig = make_history_figure(station_data_full, station["name"])
+        latest_data = station_data_full.iloc[-1].drop("timestamp")
+        index["views"][station_key] = {
+            "history": None if fig is None else add_figure(fig),
+            "latest": {col: float(value) for col, value in latest_data.items()},
+        }
+
+    # จัดวาง array แต่ละตัวให้ตรง alignment เพื่อให้ map ได้โดยไม่ต้องคัดลอก
+    index["arrays"] = []
+    offset = 0
+    for values in arrays:
+        index["arrays"].append(
+            {"offset": offset, "dtype": values.dtype.str, "shape": list(values.shape)}
+        )
+        offset = _align(offset + values.nbytes)
+
+    index_bytes = json.dumps(index).encode("utf-8")
+    data_start = _align(_HEADER_DTYPE.itemsize + len(index_bytes))
+    header = np.array([(BUNDLE_MAGIC, BUNDLE_VERSION, len(index_bytes))], dtype=_HEADER_DTYPE)
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header.tobytes())
+        f.write(index_bytes)
+        for entry, values in zip(index["arrays"], arrays):
+            f.seek(data_start + entry["offset"])
+            f.write(values.tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp_path, path)
+    print(f"Wrote bundle v{BUNDLE_VERSION} to {path}: {len(index['tables'])} tables, {len(arrays)} arrays")
+    return path
+
+
+class Bundle:
+    def __init__(self, path):
+        self.path = path
+        self._buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        header = self._buffer[:_HEADER_DTYPE.itemsize].view(_HEADER_DTYPE)[0]
+        if header["magic"] != BUNDLE_MAGIC:
+            raise ValueError(f"{path} is not a PM2.5 bundle file")
+        if header["version"] != BUNDLE_VERSION:
+            raise ValueError(
+                f"Bundle version {header['version']} is not supported (expected {BUNDLE_VERSION}), rebuild it"
+            )
+        index_end = _HEADER_DTYPE.itemsize + int(header["index_len"])
+        self.index = json.loads(self._buffer[_HEADER_DTYPE.itemsize:index_end].tobytes())
+        self._data_start = _align(index_end)
+
+    def _array(self, i):
+        entry = self.index["arrays"][i]
+        dtype = np.dtype(entry["dtype"])
+        count = int(np.prod(entry["shape"], dtype=np.int64))
+        start = self._data_start + entry["offset"]
+        values = self._buffer[start:start + count * dtype.itemsize].view(dtype)
+        return values.reshape(entry["shape"])
+
+    def _dates(self, i):
+        return self._array(i).view("datetime64[ns]")
+
+    # ตารางข้อมูลสถานีถูกคัดลอกออกจากไฟล์ที่ map ไว้ลงใน DataFrame (ข้อมูลมีขนาดเล็ก)
+    # ส่วนผลพยากรณ์อ่านจากไฟล์ที่ map ไว้โดยตรง
+    def table(self, key):
+        import pandas as pd
+
+        table = self.index["tables"][key]
+        columns = {}
+        for col in table["columns"]:
+            spec = table["data"][col]
+            if spec["kind"] == "datetime":
+                columns[col] = self._dates(spec["array"])
+            else:
+                columns[col] = self._array(spec["array"])
+        return pd.DataFrame(columns, columns=table["columns"])
+
+    def load_data(self):
+        return _LazyTables(self)
+
+    def _figure(self, i):
+        return json.loads(self._array(i).tobytes())
+
+    # กราฟย้อนหลังและค่าล่าสุดของสถานี หรือ None ถ้าไม่มีข้อมูลของสถานีนั้น
+    def station_view(self, station_key):
+        view = self.index["views"].get(station_key)
+        if view is None:
+            return None
+        history = None if view["history"] is None else self._figure(view["history"])
+        return {"history": history, "latest": view["latest"]}
+
+    def prediction_figure(self, model_type, station_key):
+        return self._figure(self.index["forecasts"][model_type][station_key]["figure"])
+
+    # วันที่คืนค่าเป็น numpy datetime64 แทน DatetimeIndex เพื่อไม่ต้อง import pandas
+    def predictor(self, model_type):
+        forecasts = self.index["forecasts"][model_type]
+
+        def predict(station_key, days_to_forecast):
+            if station_key not in forecasts:
+                raise ValueError(f"No {model_type} forecast available for {station_key} in {self.path}")
+            if days_to_forecast > self.index["forecast_days"]:
+                raise ValueError(
+                    f"Bundle only holds {self.index['forecast_days']} forecast days, {days_to_forecast} requested"
+                )
+            forecast = forecasts[station_key]
+            predicted_values = self._array(forecast["values"])[:days_to_forecast]
+            future_dates = self._dates(forecast["dates"])[:days_to_forecast]
+            return predicted_values, future_dates
+
+        return predict
+
+
+# สร้าง DataFrame ของแต่ละสถานีเมื่อถูกเรียกใช้ครั้งแรก แล้วเก็บไว้ใช้ซ้ำ
+class _LazyTables(Mapping):
+    def __init__(self, bundle):
+        self._bundle = bundle
+        self._frames = {}
+
+    def __getitem__(self, key):
+        if key not in self._frames:
+            self._frames[key] = self._bundle.table(key)
+        return self._frames[key]
+
+    def __iter__(self):
+        return iter(self._bundle.index["tables"])
+
+    def __len__(self):
+        return len(self._bundle.index["tables"])
+
+
+def load_bundle(path):
+    bundle = Bundle(path)
+    print(f"Mapped bundle v{BUNDLE_VERSION} from {path} (built {bundle.index['built_at']})")
+    return bundle
+
+
+# วัดเวลาตั้งแต่เริ่ม process จนหน้า dashboard แรกแสดงผลได้ ทั้งแบบ CSV และแบบ bundle
+# โดยจำลองลำดับ request ของ browser: หน้า index, layout, dependencies แล้วจึง callback เริ่มต้น
+# (ไม่มีปุ่มใดถูกกด) จากนั้นวัดเวลาของการกดปุ่ม Hybrid ครั้งแรกแยกไว้
+_MEASURE_SCRIPT = """
+import time
+start = time.perf_counter()
+from app import app
+client = app.server.test_client()
+for url in ["/", "/_dash-layout", "/_dash-dependencies"]:
+    response = client.get(url)
+    assert response.status_code == 200, (url, response.status_code)
+
+output, spec = next(iter(app.callback_map.items()))
+outputs = [dict(zip(["id", "property"], item.split("."))) for item in output.strip(".").split("...")]
+
+def run_callback(values, changed):
+    inputs = [dict(item, value=values.get(item["id"])) for item in spec["inputs"]]
+    response = client.post(
+        "/_dash-update-component",
+        json={"output": output, "outputs": outputs, "inputs": inputs, "changedPropIds": changed},
+    )
+    assert response.status_code == 200, response.status_code
+
+run_callback({"station-dropdown": "jsps001"}, [])
+dashboard_rendered = time.perf_counter() - start
+
+start = time.perf_counter()
+run_callback({"station-dropdown": "jsps001", "predict-hybrid-button": 1}, ["predict-hybrid-button.n_clicks"])
+print(dashboard_rendered, time.perf_counter() - start)
+"""
+
+
+def measure_startup(path=None):
+    env = dict(os.environ)
+    env.pop(BUNDLE_ENV, None)
+    if path:
+        env[BUNDLE_ENV] = path
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-c", _MEASURE_SCRIPT],
+        env=env,
+        capture_output=True,
+        text=True,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Startup measurement failed:\n{result.stderr}")
+    dashboard_rendered, first_forecast = map(float, result.stdout.strip().splitlines()[-1].split())
+    return dashboard_rendered, first_forecast, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build or measure the prebuilt PM2.5 artifact bundle")
+    parser.add_argument("command", choices=["build", "measure"])
+    parser.add_argument("--output", default=DEFAULT_BUNDLE_PATH, help="bundle file path")
+    args = parser.parse_args()
+
+    if args.command == "build":
+        build_bundle(args.output)
+    else:
+        for label, path in [("csv", None), ("bundle", args.output)]:
+            try:
+                dashboard_rendered, first_forecast, total = measure_startup(path)
+            except RuntimeError as e:
+                print(f"{label:>6}: {e}")
+                continue
+            print(
+                f"{label:>6}: first dashboard rendered after {dashboard_rendered:.3f}s, first forecast click took "
+                f"{first_forecast:.3f}s ({total:.3f}s total including interpreter start)"
+            )
@@ -1,6 +1,34 @@
 import pandas as pd
 
 
+# โโละข้อมูลจากไฟล์ CSV
+def load_data():
+    data_paths = {
+        "jsps001_fe": "data/export-jsps001-1hfe_processed.csv",  # ข้อมูลที่มี fe
+        "jsps016_fe": "data/export-jsps016-1hfe_processed.csv",
+        "jsps018_fe": "data/export-jsps018-1hfe_processed.csv",
+        "jsps001": "data/export-jsps001-1h_processed.csv",  # ข้อมูลที่ไม่มี fe
+        "jsps016": "data/export-jsps016-1h_processed.csv",
+        "jsps018": "data/export-jsps018-1h_processed.csv",
+        "jsps001full": "data/export-jsps001-1hfull_processed.csv",  # ข้อมูลที่ไม่มี fe
+        "jsps016full": "data/export-jsps016-1hfull_processed.csv",
+        "jsps018full": "data/export-jsps018-1hfull_processed.csv",
+    }
+    data = {}
+    for loc, path in data_paths.items():
+        try:
+            df = pd.read_csv(path, parse_dates=["timestamp"])
+            if df.empty:
+                print(f"Warning: {loc} data is empty!")
+            else:
+                print(f"Loaded data for {loc}: {df.shape} rows and columns")
+            data[loc] = df
+        except Exception as e:
+            print(f"Error loading data for {loc}: {e}")
+            data[loc] = pd.DataFrame()  # สร้าง DataFrame ว่างหากโหลดข้อมูลไม่สำเร็จ
+    return data
+
+
 def remove_outliers_iqr(df):
     if df is None:
         raise ValueError("DataFrame is None. Please check the input data.")
@@ -0,0 +1,65 @@
+import pandas as pd
+import plotly.express as px
+
+
+# กราฟข้อมูลย้อนหลัง 7 วันของทุก feature ที่เป็นตัวเลข
+def make_history_figure(station_data_full, station_name):
+    # Ensure the data is sorted by timestamp
+    station_data_full = station_data_full.sort_values('timestamp')
+
+    last_date = station_data_full['timestamp'].max()
+    seven_days_ago = last_date - pd.Timedelta(days=7)
+    filtered_data = station_data_full[station_data_full['timestamp'] >= seven_days_ago]
+
+    print(f"Filtered data shape: {filtered_data.shape}")
+
+    # Get all numeric columns except timestamp for plotting
+    numeric_columns = filtered_data.select_dtypes(include=['number']).columns
+    print(f"Numeric columns: {numeric_columns.tolist()}")
+
+    if len(numeric_columns) == 0:
+        return None
+
+    # Create the time series plot with all numeric columns
+    fig = px.line(
+        filtered_data,
+        x="timestamp",
+        y=numeric_columns,  # Show all numeric columns
+        title=f"All Features for {station_name} (Last 7 Days)",
+        labels={"value": "Feature Values", "timestamp": "Date"},
+        color_discrete_sequence=px.colors.qualitative.Plotly
+    )
+
+    fig.update_layout(
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20),
+        xaxis_title="Date",
+        yaxis_title="Feature Values",
+        plot_bgcolor='rgba(0,0,0,0)',
+        paper_bgcolor='rgba(0,0,0,0)',
+        legend_title="Features"
+    )
+    return fig
+
+
+# กราฟผลพยากรณ์ของโมเดลที่เลือก
+def make_prediction_figure(predicted_values, future_dates, model_type, station_name):
+    prediction_fig = px.line(
+        x=future_dates,
+        y=predicted_values,
+        title=f"{model_type.capitalize()} Prediction for {station_name} (Next 7 Days)",
+        labels={"y": "Predicted PM2.5 (μg/m³)", "x": "Date"},
+        color_discrete_sequence=['#FF5733']
+    )
+
+    # Update layout for better visualization
+    prediction_fig.update_layout(
+        height=200,  # Reduced height to fit screen
+        margin=dict(l=20, r=20, t=40, b=20),  # Reduced margins
+        xaxis_title="",
+        yaxis_title="PM2.5",
+        showlegend=False,
+        plot_bgcolor='white',  # Set background color to white
+        paper_bgcolor='white'  # Set paper background color to white
+    )
+    return prediction_fig
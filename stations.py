@@ -0,0 +1,6 @@
+# สถานที่และตำแหน่ง
+locations = {
+    "jsps001": {"name": "JSPs001", "lat": 13.7563, "lon": 100.5018},
+    "jsps016": {"name": "JSPs016", "lat": 13.7363, "lon": 100.5218},
+    "jsps018": {"name": "JSPs018", "lat": 13.7263, "lon": 100.5318},
+}
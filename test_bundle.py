@@ -0,0 +1,95 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from bundle import BUNDLE_MAGIC, Bundle, build_bundle
+from data_processing import load_data
+
+
+def fake_predictor(offset):
+    def predict(station_key, days_to_forecast):
+        future_dates = pd.date_range("2025-02-12", periods=days_to_forecast, freq="D")
+        return pd.Series(np.arange(days_to_forecast) + offset), future_dates
+
+    return predict
+
+
+FAKE_PREDICTORS = {
+    "arima": fake_predictor(1.0),
+    "regression": fake_predictor(2.0),
+    "hybrid": fake_predictor(1.5),
+}
+
+
+@pytest.fixture(autouse=True)
+def repo_dir(monkeypatch):
+    monkeypatch.chdir(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def bundle_path(tmp_path):
+    path = str(tmp_path / "pm25.bundle")
+    build_bundle(path, predictors=FAKE_PREDICTORS)
+    return path
+
+
+def test_load_data_matches_csv(bundle_path):
+    expected = load_data()
+    data = Bundle(bundle_path).load_data()
+    assert list(data) == list(expected)
+    for key, df in expected.items():
+        assert data[key]["timestamp"].dtype == np.dtype("datetime64[ns]")
+        pd.testing.assert_frame_equal(data[key], df)
+
+
+def test_predictor_returns_stored_forecast(bundle_path):
+    bundle = Bundle(bundle_path)
+    predicted_values, future_dates = bundle.predictor("hybrid")("jsps016", 3)
+    np.testing.assert_array_equal(predicted_values, [1.5, 2.5, 3.5])
+    np.testing.assert_array_equal(future_dates, pd.date_range("2025-02-12", periods=3, freq="D").values)
+
+
+def test_station_view_matches_csv(bundle_path):
+    station_data_full = load_data()["jsps018full"].sort_values("timestamp")
+    view = Bundle(bundle_path).station_view("jsps018")
+    assert view["latest"] == station_data_full.iloc[-1].drop("timestamp").to_dict()
+    assert view["history"]["layout"]["title"]["text"] == "All Features for JSPs018 (Last 7 Days)"
+    assert len(view["history"]["data"]) == 4
+
+
+def test_prediction_figure(bundle_path):
+    figure = Bundle(bundle_path).prediction_figure("regression", "jsps001")
+    assert figure["layout"]["title"]["text"] == "Regression Prediction for JSPs001 (Next 7 Days)"
+    assert figure["data"][0]["y"] == [2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0]
+
+
+def test_predictor_rejects_more_days_than_stored(bundle_path):
+    with pytest.raises(ValueError):
+        Bundle(bundle_path).predictor("arima")("jsps001", 8)
+
+
+def test_build_rejects_misaligned_forecast(tmp_path):
+    def short_predictor(station_key, days_to_forecast):
+        return np.zeros(days_to_forecast), pd.date_range("2025-02-12", periods=days_to_forecast - 1, freq="D")
+
+    predictors = dict(FAKE_PREDICTORS, hybrid=short_predictor)
+    with pytest.raises(ValueError):
+        build_bundle(str(tmp_path / "pm25.bundle"), predictors=predictors)
+    assert not os.listdir(tmp_path)
+
+
+def test_bad_magic_raises(bundle_path):
+    with open(bundle_path, "r+b") as f:
+        f.write(b"NOTABNDL")
+    with pytest.raises(ValueError):
+        Bundle(bundle_path)
+
+
+def test_bad_version_raises(bundle_path):
+    with open(bundle_path, "r+b") as f:
+        f.seek(len(BUNDLE_MAGIC))
+        f.write(np.array([99], dtype="<u4").tobytes())
+    with pytest.raises(ValueError):
+        Bundle(bundle_path)